@@ -38,19 +38,35 @@ sudo apt-get install tesseract-ocr poppler-utils   # Debian/Ubuntu
 from __future__ import annotations
 
 import argparse
+import functools
+import hashlib
+import importlib.util
+import json
 import logging
+import multiprocessing
+import os
+import queue
 import re
+import shlex
 import sys
+import tempfile
+import threading
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, as_completed, wait
 from dataclasses import dataclass
 from pathlib import Path
-from typing import List, Set
+from typing import Dict, FrozenSet, Iterable, List, Set, Tuple
 
 import pandas as pd
 import pytesseract
-from pdf2image import convert_from_path, exceptions as pdf2image_exceptions
-from PIL.Image import Image  # type‑hints
+from pdf2image import convert_from_path, exceptions as pdf2image_exceptions, pdfinfo_from_path
+from PIL import Image
+from pypdf import PdfReader
+from rapidfuzz.distance import Levenshtein
 from unidecode import unidecode
 
+# Lector de Excel en Rust (opcional); si falta se usa openpyxl.
+_HAS_CALAMINE = importlib.util.find_spec("python_calamine") is not None
+
 __all__ = [
     "normalize_name",
     "PdfNameExtractor",
@@ -66,7 +82,23 @@ BASE_DIR = Path(__file__).resolve().parent
 PDF_DIR = BASE_DIR / "SUA"
 EXCEL_DIR = BASE_DIR / "EXCEL"
 OUTPUT_DIR = BASE_DIR / "OUTPUT"
+CACHE_DIR = BASE_DIR / ".cache"
+# Incrementar siempre que cambie la extracción (regex, filas mínimas, binarización…):
+# invalida las cachés escritas con la lógica anterior.
+CACHE_VERSION = 2
 NAME_COLUMN = "Nombre Completo"
+FUZZY_COLUMN = "Coincidencia aproximada"
+GRAM_SIZE = 4  # tamaño de los n‑gramas del índice de coincidencia aproximada
+OCR_BATCH_SIZE = 40  # páginas máximas por invocación de Tesseract
+RASTER_PAGES_PER_THREAD = 4  # páginas por hilo de pdftoppm en cada bloque de rasterización
+PARALLEL_MATCH_MIN_ROWS = 10_000  # por debajo, arrancar procesos cuesta más de lo que ahorra
+# Filas de trabajador (NSS + nombre) mínimas en el texto embebido para omitir el OCR de una
+# página; el encabezado digital de un PDF híbrido con cuerpo raster no las tiene.
+MIN_TEXT_ROWS = 3
+# Los nombres del SUA vienen en mayúsculas: limitar el alfabeto acelera el decodificador LSTM.
+# Solo se aplica con ``roi``: en la página completa convertiría los dígitos (NSS, importes)
+# en letras y las filas dejarían de normalizarse al nombre.
+NAME_CHARS = "ABCDEFGHIJKLMNOPQRSTUVWXYZÁÉÍÓÚÑ"
 
 # ---------------------------------------------------------------------------
 # Configuración de logging
@@ -81,12 +113,101 @@ logging.basicConfig(
 # Utilidades
 # ---------------------------------------------------------------------------
 
+_NON_ALPHA_RE = re.compile(r"[^A-Za-z\s]")
+_MULTISPACE_RE = re.compile(r"\s+")
+# Líneas OCR con al menos una letra (candidatas a nombre).
+_NAME_LINE_RE = re.compile(r"^.*[^\W\d_].*$", re.MULTILINE)
+# Filas de trabajador: un NSS de 11 dígitos (con o sin guiones/espacios) y al menos dos palabras.
+_WORKER_ROW_RE = re.compile(
+    r"^(?=.*\b\d{2}[- ]?\d{2}[- ]?\d{2}[- ]?\d{4}[- ]?\d\b)(?=.*[^\W\d_]{2,}\s+[^\W\d_]{2,}).*$",
+    re.MULTILINE,
+)
+
+
+# Acentos del español → ASCII; ``unidecode`` queda solo para otros caracteres (raros).
+_ACCENT_TABLE = str.maketrans("ÁÉÍÓÚÜÑáéíóúüñ", "AEIOUUNaeiouun")
+
+
+def _to_ascii(name: str) -> str:
+    folded = name.translate(_ACCENT_TABLE)
+    return folded if folded.isascii() else unidecode(folded)
+
+
+@functools.lru_cache(maxsize=100_000)
 def normalize_name(name: str) -> str:
     """Normaliza un nombre para comparación."""
-    ascii_txt = unidecode(name)
-    clean_txt = re.sub(r"[^A-Za-z\s]", " ", ascii_txt)
-    collapsed = re.sub(r"\s+", " ", clean_txt).strip()
-    return collapsed.upper()
+    return _MULTISPACE_RE.sub(" ", _NON_ALPHA_RE.sub(" ", _to_ascii(name))).strip().upper()
+
+
+def _normalize_series(names: pd.Series) -> pd.Series:
+    """Versión vectorizada de :func:`normalize_name` para una columna completa."""
+    folded = names.astype(str).str.translate(_ACCENT_TABLE)
+    non_ascii = ~folded.map(str.isascii)
+    if non_ascii.any():
+        folded[non_ascii] = folded[non_ascii].map(unidecode)
+    return (
+        folded.str.replace(_NON_ALPHA_RE, " ", regex=True)
+        .str.replace(_MULTISPACE_RE, " ", regex=True)
+        .str.strip()
+        .str.upper()
+    )
+
+
+def _grams(name: str) -> Set[str]:
+    """n‑gramas de ``GRAM_SIZE`` caracteres de un nombre (el nombre completo si es más corto)."""
+    if len(name) <= GRAM_SIZE:
+        return {name}
+    return {name[i : i + GRAM_SIZE] for i in range(len(name) - GRAM_SIZE + 1)}
+
+
+def _build_gram_index(names: Iterable[str]) -> Dict[str, Set[str]]:
+    """Índice de bloqueo n‑grama → nombres, para acotar la búsqueda aproximada."""
+    index: Dict[str, Set[str]] = {}
+    for name in names:
+        for gram in _grams(name):
+            index.setdefault(gram, set()).add(name)
+    return index
+
+
+def _fuzzy_match(name: str, index: Dict[str, Set[str]], max_distance: int) -> bool:
+    """Indica si algún nombre del índice está a ≤ ``max_distance`` ediciones de ``name``."""
+    candidates: Set[str] = set()
+    for gram in _grams(name):
+        candidates.update(index.get(gram, ()))
+    return any(
+        Levenshtein.distance(name, candidate, score_cutoff=max_distance) <= max_distance
+        for candidate in candidates
+        if abs(len(candidate) - len(name)) <= max_distance
+    )
+
+
+def _match_names(
+    names: pd.Series, pdf_names: FrozenSet[str], index: Dict[str, Set[str]], max_distance: int
+) -> Tuple[pd.Series, pd.Series]:
+    """Devuelve dos máscaras: coincidencia exacta y coincidencia aproximada (solo entre los fallos)."""
+    normalized = _normalize_series(names)
+    exact = normalized.isin(pdf_names)
+    approx = pd.Series(False, index=normalized.index)
+
+    # Solo los nombres sin coincidencia exacta pagan la búsqueda aproximada.
+    if max_distance > 0 and not exact.all():
+        misses = normalized[~exact]
+        approx.loc[misses.index] = misses.map(lambda n: _fuzzy_match(n, index, max_distance))
+    return exact, approx
+
+
+# Estado de cada proceso de validación: (nombres del PDF, índice n‑grama, distancia máxima).
+_MATCH_STATE: Tuple[FrozenSet[str], Dict[str, Set[str]], int] | None = None
+
+
+def _init_match_worker(pdf_names: FrozenSet[str], max_distance: int) -> None:
+    global _MATCH_STATE
+    index = _build_gram_index(pdf_names) if max_distance > 0 else {}
+    _MATCH_STATE = (pdf_names, index, max_distance)
+
+
+def _match_chunk(names: pd.Series) -> Tuple[pd.Series, pd.Series]:
+    return _match_names(names, *_MATCH_STATE)
 
 # ---------------------------------------------------------------------------
 # OCR extractor
@@ -96,45 +217,424 @@ class PdfExtractionError(RuntimeError):
     """Error genérico al convertir/leer PDF."""
 
 
+# API de libtesseract propia de cada proceso OCR (``None`` → se usa pytesseract).
+_TESS_API = None
+
+
+def _init_ocr_worker(tesseract_cmd: str | None, lang: str = "spa", config: str = "") -> None:
+    """Inicializa cada proceso OCR: Tesseract serial (sin OpenMP) y binario opcional.
+
+    Si ``tesserocr`` está instalado, crea una única ``PyTessBaseAPI`` que el proceso
+    reutiliza para todas sus páginas, de modo que el modelo se carga una sola vez.
+    """
+    global _TESS_API
+    os.environ.setdefault("OMP_THREAD_LIMIT", "1")
+    if tesseract_cmd:
+        pytesseract.pytesseract.tesseract_cmd = tesseract_cmd
+    # Import tardío: libgomp lee OMP_THREAD_LIMIT al cargarse, así que debe estar ya definido.
+    try:
+        import tesserocr
+    except ImportError:  # pragma: no cover - se usa pytesseract como respaldo
+        return
+    try:
+        api = tesserocr.PyTessBaseAPI(lang=lang)
+    except RuntimeError as exc:
+        logger.warning("tesserocr no pudo inicializarse, se usará pytesseract: %s", exc)
+        return
+    _apply_tesseract_config(api, config)
+    _TESS_API = api
+
+
+def _apply_tesseract_config(api, config: str) -> None:
+    """Traduce opciones estilo CLI (``--psm N``, ``-c clave=valor``) a la API de tesserocr."""
+    args = shlex.split(config)
+    for opt, value in zip(args, args[1:]):
+        if opt == "--psm":
+            api.SetPageSegMode(int(value))
+        elif opt == "-c" and "=" in value:
+            api.SetVariable(*value.split("=", 1))
+
+
+def _names_from_text(text: str) -> Set[str]:
+    """Devuelve los nombres normalizados (≥ 2 palabras) presentes en un texto OCR."""
+    page_names = set(map(normalize_name, _NAME_LINE_RE.findall(text)))
+    return {n for n in page_names if len(n.split()) >= 2}
+
+
+def _contiguous_ranges(pages: List[int]) -> List[Tuple[int, int]]:
+    """Agrupa números de página ordenados en rangos contiguos: ``[1, 2, 5]`` → ``[(1, 2), (5, 5)]``."""
+    ranges: List[Tuple[int, int]] = []
+    for page in pages:
+        if ranges and page == ranges[-1][1] + 1:
+            ranges[-1] = (ranges[-1][0], page)
+        else:
+            ranges.append((page, page))
+    return ranges
+
+
+def _otsu_threshold(histogram: List[int]) -> int:
+    """Umbral de Otsu a partir del histograma de una imagen en escala de grises."""
+    total = sum(histogram)
+    sum_all = sum(i * h for i, h in enumerate(histogram))
+    sum_bg = weight_bg = 0
+    best_var, threshold = 0.0, 127
+    for i, h in enumerate(histogram):
+        weight_bg += h
+        if weight_bg == 0:
+            continue
+        weight_fg = total - weight_bg
+        if weight_fg == 0:
+            break
+        sum_bg += i * h
+        mean_bg = sum_bg / weight_bg
+        mean_fg = (sum_all - sum_bg) / weight_fg
+        var = weight_bg * weight_fg * (mean_bg - mean_fg) ** 2
+        if var > best_var:
+            best_var, threshold = var, i
+    return threshold
+
+
+def _binarize_page(path: str, roi: Tuple[int, int, int, int] | None = None) -> str:
+    """Recorta (opcional) y binariza una página (Otsu); devuelve la ruta del PNG resultante.
+
+    La imagen original se borra en cuanto se genera el PNG.
+    """
+    out = str(Path(path).with_suffix(".png"))
+    with Image.open(path) as img:
+        gray = (img.crop(roi) if roi else img).convert("L")
+        threshold = _otsu_threshold(gray.histogram())
+        gray.point(lambda p: 255 if p > threshold else 0, mode="1").save(out)
+    os.unlink(path)
+    return out
+
+
+def _ocr_batch(
+    pages: List[str],
+    filelist: str,
+    lang: str = "spa",
+    config: str = "",
+    roi: Tuple[int, int, int, int] | None = None,
+) -> List[Set[str]]:
+    """Aplica OCR a un lote de páginas con una sola invocación de Tesseract.
+
+    Cada página se recorta a ``roi`` (si se indica) y se binariza antes del OCR (menos
+    datos y mejor contraste). Con ``tesserocr`` disponible se reutiliza la API del
+    proceso, página por página; si no, ``filelist`` es el archivo donde se listan las
+    imágenes, una ruta por línea, y Tesseract separa cada página de la salida con un
+    salto de página (``\\f``). Las imágenes se borran tras el OCR para que el uso de
+    disco y memoria no crezca con el número de páginas.
+    """
+    if _TESS_API is not None:
+        results = []
+        for page in pages:
+            path = _binarize_page(page, roi)
+            try:
+                _TESS_API.SetImageFile(path)
+                results.append(_names_from_text(_TESS_API.GetUTF8Text()))
+            except RuntimeError as exc:
+                # Mismo tratamiento que un fallo de pytesseract: se omite el lote completo.
+                raise pytesseract.TesseractError(-1, str(exc)) from exc
+            finally:
+                os.unlink(path)
+        return results
+
+    binarized = [_binarize_page(page, roi) for page in pages]
+    try:
+        Path(filelist).write_text("\n".join(binarized) + "\n", encoding="utf-8")
+        text = pytesseract.image_to_string(filelist, lang=lang, config=config)
+    finally:
+        for path in binarized:
+            os.unlink(path)
+    return [_names_from_text(page) for page in text.split("\f")]
+
+
 @dataclass
 class PdfNameExtractor:
     pdf_path: Path
     tesseract_cmd: str | None = None
-    dpi: int = 300
-
-    def extract_names(self) -> Set[str]:
+    dpi: int = 200
+    lang: str = "spa"
+    tesseract_config: str = "--psm 6"
+    roi: Tuple[int, int, int, int] | None = None  # (izq, sup, der, inf) en píxeles al dpi dado
+    first_page: int | None = None  # None → desde la primera página
+    last_page: int | None = None  # None → hasta la última página
+    workers: int | None = None  # None → os.cpu_count()
+    thread_count: int | None = None  # hilos de pdftoppm; None → os.cpu_count()
+    cache_dir: Path | None = CACHE_DIR  # None → sin caché de resultados
+
+    @property
+    def ocr_config(self) -> str:
+        """Configuración efectiva de Tesseract (con lista blanca de letras si hay ``roi``)."""
+        if self.roi is None:
+            return self.tesseract_config
+        return f"{self.tesseract_config} -c tessedit_char_whitelist={NAME_CHARS}"
+
+    def _cache_path(self) -> Path:
+        """Ruta de caché: hash del contenido del PDF + parámetros que afectan el resultado."""
+        digest = hashlib.sha256()
+        with self.pdf_path.open("rb") as fh:
+            for chunk in iter(lambda: fh.read(1 << 20), b""):
+                digest.update(chunk)
+        # find_spec no importa tesserocr (ni libgomp) en el proceso principal.
+        backend = "tesserocr" if importlib.util.find_spec("tesserocr") else "pytesseract"
+        settings = repr(
+            (CACHE_VERSION, backend, self.ocr_config, self.roi, self.first_page, self.last_page)
+        )
+        settings_key = hashlib.sha256(settings.encode()).hexdigest()[:12]
+        return self.cache_dir / f"{digest.hexdigest()}_{self.dpi}_{self.lang}_{settings_key}.json"
+
+    def extract_names(self) -> FrozenSet[str]:
+        # N procesos con Tesseract serial rinden más que uno con N hilos OpenMP.
+        os.environ.setdefault("OMP_THREAD_LIMIT", "1")
         if self.tesseract_cmd:
             pytesseract.pytesseract.tesseract_cmd = self.tesseract_cmd
 
         if not self.pdf_path.is_file():
             raise PdfExtractionError(f"PDF no encontrado: {self.pdf_path}")
 
+        cache_path = self._cache_path() if self.cache_dir is not None else None
+        if cache_path is not None and cache_path.is_file():
+            try:
+                names = frozenset(json.loads(cache_path.read_text(encoding="utf-8")))
+            except (OSError, ValueError) as exc:
+                logger.warning("Caché ilegible '%s', se vuelve a procesar: %s", cache_path, exc)
+            else:
+                logger.info("Nombres del PDF leídos de caché '%s': %d", cache_path, len(names))
+                return names
+
+        # Las páginas con texto embebido no necesitan OCR.
+        names, pending = self._extract_text_layer()
+        complete = True
+
+        if pending:
+            # Las páginas se escriben en disco: evita mantener todo el PDF rasterizado en RAM.
+            with tempfile.TemporaryDirectory(prefix="sua_") as tmpdir:
+                ocr_names, complete = self._ocr_pages(pending, tmpdir)
+                names.update(ocr_names)
+
+        logger.info("Total de nombres extraídos del PDF: %d", len(names))
+
+        if cache_path is not None and not complete:
+            logger.warning("Hubo páginas sin OCR: el resultado no se guarda en caché")
+        elif cache_path is not None:
+            try:
+                cache_path.parent.mkdir(parents=True, exist_ok=True)
+                cache_path.write_text(json.dumps(sorted(names), ensure_ascii=False), encoding="utf-8")
+            except OSError as exc:
+                logger.warning("No se pudo guardar la caché '%s': %s", cache_path, exc)
+
+        return frozenset(names)
+
+    def _extract_text_layer(self) -> Tuple[Set[str], List[Tuple[int | None, int | None]]]:
+        """Lee el texto embebido y devuelve los nombres hallados y los rangos que requieren OCR."""
+        names: Set[str] = set()
         try:
-            logger.info("Convirtiendo '%s' a imágenes (dpi=%s)…", self.pdf_path, self.dpi)
-            images: List[Image] = convert_from_path(str(self.pdf_path), dpi=self.dpi)
-        except pdf2image_exceptions.PDFInfoNotInstalledError as exc:
-            raise PdfExtractionError("poppler utils no instalados o 'pdfinfo' no está en PATH") from exc
+            reader = PdfReader(self.pdf_path)
+            total = len(reader.pages)
         except Exception as exc:
-            raise PdfExtractionError("Fallo al convertir PDF a imágenes") from exc
+            logger.warning("No se pudo leer el texto embebido del PDF, se usará OCR: %s", exc)
+            return names, [(self.first_page, self.last_page)]
 
-        names: Set[str] = set()
-        for i, img in enumerate(images, start=1):
+        first = self.first_page or 1
+        if first > total:
+            raise PdfExtractionError(
+                f"La página inicial {first} excede el total de páginas del PDF ({total})"
+            )
+        last = min(self.last_page or total, total)
+        pending: List[int] = []
+        for page_no in range(first, last + 1):
             try:
-                text = pytesseract.image_to_string(img, lang="spa")
-            except pytesseract.TesseractError as exc:
-                logger.warning("OCR falló en página %s: %s", i, exc)
-                continue
-
-            page_names = {
-                normalize_name(line)
-                for line in text.splitlines()
-                if line.strip() and any(c.isalpha() for c in line)
-            }
-            names.update({n for n in page_names if len(n.split()) >= 2})
-            logger.debug("Página %s: %d nombres detectados", i, len(page_names))
-
-        logger.info("Total de nombres extraídos del PDF: %d", len(names))
-        return names
+                text = reader.pages[page_no - 1].extract_text() or ""
+            except Exception as exc:
+                logger.debug("Página %s: sin texto extraíble (%s)", page_no, exc)
+                text = ""
+            rows = _WORKER_ROW_RE.findall(text)
+            if len(rows) >= MIN_TEXT_ROWS:
+                page_names = _names_from_text("\n".join(rows))
+                names.update(page_names)
+                logger.debug("Página %s: %d nombres desde texto embebido", page_no, len(page_names))
+            else:
+                pending.append(page_no)
+
+        logger.info(
+            "Páginas con texto embebido: %d; páginas para OCR: %d",
+            last - first + 1 - len(pending),
+            len(pending),
+        )
+        return names, _contiguous_ranges(pending)
+
+    def _page_chunks(
+        self, ranges: List[Tuple[int | None, int | None]], first_size: int, chunk_size: int
+    ) -> List[Tuple[int, int]]:
+        """Divide los rangos de páginas en bloques: el primero de ``first_size`` páginas como
+        máximo (para que el OCR empiece pronto) y los demás de ``chunk_size``."""
+        chunks: List[Tuple[int, int]] = []
+        for first, last in ranges:
+            first = first or 1
+            if last is None:
+                try:
+                    last = pdfinfo_from_path(str(self.pdf_path))["Pages"]
+                except pdf2image_exceptions.PDFInfoNotInstalledError as exc:
+                    raise PdfExtractionError("poppler utils no instalados o 'pdfinfo' no está en PATH") from exc
+                except Exception as exc:
+                    raise PdfExtractionError("Fallo al leer la información del PDF") from exc
+            start = first
+            while start <= last:
+                size = chunk_size if chunks else first_size
+                chunks.append((start, min(start + size - 1, last)))
+                start += size
+        return chunks
+
+    def _rasterize(
+        self,
+        chunks: List[Tuple[int, int]],
+        output_folder: str,
+        thread_count: int,
+        ready: queue.Queue,
+        stop: threading.Event,
+    ) -> None:
+        """Productor: rasteriza cada bloque y lo encola como pares ``(número de página, ruta)``.
+
+        Termina con ``None`` o, si falla, encolando la excepción para el consumidor. Se
+        detiene antes del siguiente bloque si el consumidor activa ``stop``.
+        """
+        try:
+            for first, last in chunks:
+                if stop.is_set():
+                    return
+                try:
+                    paths = convert_from_path(
+                        str(self.pdf_path),
+                        dpi=self.dpi,
+                        thread_count=thread_count,
+                        fmt="jpeg",
+                        output_folder=output_folder,
+                        paths_only=True,
+                        first_page=first,
+                        last_page=last,
+                    )
+                except pdf2image_exceptions.PDFInfoNotInstalledError as exc:
+                    raise PdfExtractionError("poppler utils no instalados o 'pdfinfo' no está en PATH") from exc
+                except Exception as exc:
+                    raise PdfExtractionError("Fallo al convertir PDF a imágenes") from exc
+                ready.put(list(enumerate(paths, start=first)))
+        except PdfExtractionError as exc:
+            ready.put(exc)
+        else:
+            ready.put(None)
+
+    def _ocr_pages(
+        self, ranges: List[Tuple[int | None, int | None]], workdir: str
+    ) -> Tuple[Set[str], bool]:
+        """Rasteriza y aplica OCR en paralelo.
+
+        ``convert_from_path`` solo devuelve un bloque cuando termina de rasterizarlo, así que
+        el primero es pequeño (una página por hilo de pdftoppm): su OCR arranca mientras
+        poppler rasteriza el resto, en bloques de ``RASTER_PAGES_PER_THREAD`` páginas por
+        hilo. Mientras haya procesos OCR ociosos se envían lotes con lo ya rasterizado, aunque
+        no lleguen al tamaño de lote. Devuelve los nombres y si todos los lotes se procesaron
+        sin error.
+        """
+        thread_count = max(1, self.thread_count or os.cpu_count() or 1)
+        chunks = self._page_chunks(ranges, thread_count, thread_count * RASTER_PAGES_PER_THREAD)
+        total = sum(last - first + 1 for first, last in chunks)
+        names: Set[str] = set()
+        complete = True
+        if not total:
+            return names, complete
+
+        max_workers = max(1, min(self.workers or os.cpu_count() or 1, total))
+        # Lotes de OCR independientes de los bloques: uno por proceso, sin superar
+        # OCR_BATCH_SIZE (Tesseract se cuelga con listas largas).
+        batch_size = max(1, min(OCR_BATCH_SIZE, -(-total // max_workers)))
+        logger.info(
+            "Convirtiendo '%s' a imágenes (dpi=%s, hilos=%s) y aplicando OCR a %d páginas "
+            "en lotes de hasta %d con %d procesos…",
+            self.pdf_path,
+            self.dpi,
+            thread_count,
+            total,
+            batch_size,
+            max_workers,
+        )
+
+        # Cola acotada: poppler no se adelanta más de 2 bloques al OCR.
+        ready: queue.Queue = queue.Queue(maxsize=2)
+        stop = threading.Event()
+        producer = threading.Thread(
+            target=self._rasterize, args=(chunks, workdir, thread_count, ready, stop), daemon=True
+        )
+        producer.start()
+
+        # Los procesos OCR se crean bajo demanda mientras el productor corre: hacer ``fork``
+        # con un hilo activo puede bloquearse, así que se usa forkserver donde exista.
+        mp_context = (
+            multiprocessing.get_context("forkserver")
+            if "forkserver" in multiprocessing.get_all_start_methods()
+            else None
+        )
+        try:
+            with ProcessPoolExecutor(
+                max_workers=max_workers,
+                mp_context=mp_context,
+                initializer=_init_ocr_worker,
+                initargs=(self.tesseract_cmd, self.lang, self.ocr_config),
+            ) as executor:
+                in_flight: Dict[Future, List[Tuple[int, str]]] = {}
+                pending: List[Tuple[int, str]] = []
+                b = 0
+
+                def submit(batch: List[Tuple[int, str]]) -> None:
+                    nonlocal b, complete
+                    filelist = Path(workdir) / f"filelist_{b:04d}.txt"
+                    paths = [path for _, path in batch]
+                    future = executor.submit(
+                        _ocr_batch, paths, str(filelist), self.lang, self.ocr_config, self.roi
+                    )
+                    in_flight[future] = batch
+                    b += 1
+                    if len(in_flight) >= max_workers * 2:
+                        done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                        for future in done:
+                            complete &= self._collect(future, in_flight.pop(future), names)
+
+                while (chunk := ready.get()) is not None:
+                    if isinstance(chunk, Exception):
+                        raise chunk
+                    pending.extend(chunk)
+                    while len(pending) >= batch_size or (
+                        pending and sum(not f.done() for f in in_flight) < max_workers
+                    ):
+                        submit(pending[:batch_size])
+                        del pending[:batch_size]
+                if pending:
+                    submit(pending)
+
+                for future in as_completed(in_flight):
+                    complete &= self._collect(future, in_flight[future], names)
+        finally:
+            # Desbloquea y espera al productor antes de borrar el directorio temporal.
+            stop.set()
+            while producer.is_alive():
+                try:
+                    ready.get(timeout=0.1)
+                except queue.Empty:
+                    pass
+            producer.join()
+        return names, complete
+
+    @staticmethod
+    def _collect(future: Future, batch: List[Tuple[int, str]], names: Set[str]) -> bool:
+        """Añade a ``names`` el resultado de un lote; ``False`` si su OCR falló."""
+        try:
+            batch_names = future.result()
+        except pytesseract.TesseractError as exc:
+            logger.warning("OCR falló en páginas %s-%s: %s", batch[0][0], batch[-1][0], exc)
+            return False
+        for (page_no, _), page_names in zip(batch, batch_names):
+            names.update(page_names)
+            logger.debug("Página %s: %d nombres detectados", page_no, len(page_names))
+        return True
 
 # ---------------------------------------------------------------------------
 # Excel validator
@@ -144,13 +644,43 @@ class PdfNameExtractor:
 class ExcelNameValidator:
     excel_path: Path
     output_path: Path
-
-    def validate(self, pdf_names: Set[str]) -> None:
+    parquet_path: Path | None = None  # copia opcional en Parquet (requiere pyarrow)
+    # Ediciones toleradas por errores de OCR (0 → desactivado). Los aciertos aproximados van a
+    # FUZZY_COLUMN, nunca a "Existe en SUA": una edición separa a DANIEL de DANIELA.
+    max_distance: int = 0
+    workers: int | None = None  # None → os.cpu_count(); solo para listas ≥ PARALLEL_MATCH_MIN_ROWS
+
+    def _match(self, names: pd.Series, pdf_names: FrozenSet[str]) -> Tuple[pd.Series, pd.Series]:
+        workers = max(1, self.workers or os.cpu_count() or 1)
+        if len(names) < PARALLEL_MATCH_MIN_ROWS or workers == 1:
+            index = _build_gram_index(pdf_names) if self.max_distance > 0 else {}
+            return _match_names(names, pdf_names, index, self.max_distance)
+
+        # pdf_names se envía una vez por proceso (initializer), no con cada bloque.
+        size = -(-len(names) // workers)
+        chunks = [names.iloc[i : i + size] for i in range(0, len(names), size)]
+        logger.info("Validando %d nombres en %d procesos…", len(names), len(chunks))
+        with ProcessPoolExecutor(
+            max_workers=len(chunks),
+            initializer=_init_match_worker,
+            initargs=(pdf_names, self.max_distance),
+        ) as executor:
+            results = list(executor.map(_match_chunk, chunks))
+        return pd.concat([exact for exact, _ in results]), pd.concat([approx for _, approx in results])
+
+    def _read_excel(self) -> pd.DataFrame:
+        # Se leen todas las columnas porque la salida debe ser idéntica al original.
+        if _HAS_CALAMINE:
+            return pd.read_excel(self.excel_path, engine="calamine")
+        logger.debug("python-calamine no disponible; se lee el Excel con openpyxl")
+        return pd.read_excel(self.excel_path, engine="openpyxl")
+
+    def validate(self, pdf_names: FrozenSet[str]) -> None:
         if not self.excel_path.is_file():
             raise FileNotFoundError(f"Excel no encontrado: {self.excel_path}")
 
         try:
-            df = pd.read_excel(self.excel_path)
+            df = self._read_excel()
         except Exception as exc:
             logger.error("Error al leer Excel: %s", exc)
             raise
@@ -160,24 +690,70 @@ class ExcelNameValidator:
                 f"La columna '{NAME_COLUMN}' no existe en el Excel. Columnas disponibles: {list(df.columns)}"
             )
 
-        df["_NombreNormalizado"] = df[NAME_COLUMN].astype(str).apply(normalize_name)
-        df["Existe en SUA"] = df["_NombreNormalizado"].apply(lambda n: n in pdf_names)
-        df.drop(columns="_NombreNormalizado", inplace=True)
+        exact, approx = self._match(df[NAME_COLUMN], pdf_names)
+        df["Existe en SUA"] = exact
+        if self.max_distance > 0:
+            df[FUZZY_COLUMN] = approx
+            logger.info(
+                "Coincidencias aproximadas (≤ %d ediciones, columna '%s'): %d de %d",
+                self.max_distance,
+                FUZZY_COLUMN,
+                int(approx.sum()),
+                int((~exact).sum()),
+            )
 
         self.output_path.parent.mkdir(parents=True, exist_ok=True)
 
+        # xlsxwriter es mucho más rápido que openpyxl para escribir. No se usa
+        # ``constant_memory``: pandas escribe por columnas y ese modo exige filas en orden.
         try:
-            df.to_excel(self.output_path, index=False)
+            with pd.ExcelWriter(self.output_path, engine="xlsxwriter") as writer:
+                df.to_excel(writer, index=False)
         except Exception as exc:
             logger.error("No se pudo escribir la salida '%s': %s", self.output_path, exc)
             raise
 
         logger.info("Archivo con validación guardado en '%s'", self.output_path)
 
+        if self.parquet_path is not None:
+            try:
+                df.to_parquet(self.parquet_path, index=False)
+            except ImportError as exc:
+                logger.warning("No se generó Parquet (instala pyarrow): %s", exc)
+            except Exception as exc:
+                # p. ej. columnas con tipos mezclados; el .xlsx ya está guardado.
+                logger.warning("No se pudo escribir la copia Parquet '%s': %s", self.parquet_path, exc)
+            else:
+                logger.info("Copia Parquet guardada en '%s'", self.parquet_path)
+
 # ---------------------------------------------------------------------------
 # CLI
 # ---------------------------------------------------------------------------
 
+def _parse_roi(value: str) -> Tuple[int, int, int, int]:
+    """Convierte ``'izq,sup,der,inf'`` en una tupla de enteros para ``--roi``."""
+    try:
+        left, top, right, bottom = (int(v) for v in value.split(","))
+    except ValueError as exc:
+        raise argparse.ArgumentTypeError(f"ROI inválida '{value}', usa 'izq,sup,der,inf'") from exc
+    if right <= left or bottom <= top:
+        raise argparse.ArgumentTypeError(f"ROI vacía: '{value}'")
+    return left, top, right, bottom
+
+
+def _parse_pages(value: str) -> Tuple[int, int]:
+    """Convierte ``'1-3'`` en ``(1, 3)`` y ``'5'`` en ``(5, 5)`` para ``--pages``."""
+    first, sep, last = value.partition("-")
+    try:
+        first_page = int(first)
+        last_page = int(last) if sep else first_page
+    except ValueError as exc:
+        raise argparse.ArgumentTypeError(f"Rango de páginas inválido '{value}', usa '1-3' o '5'") from exc
+    if first_page < 1 or last_page < first_page:
+        raise argparse.ArgumentTypeError(f"Rango de páginas inválido '{value}'")
+    return first_page, last_page
+
+
 def parse_args(argv: List[str] | None = None) -> argparse.Namespace:
     parser = argparse.ArgumentParser(
         description="Valida coincidencia de nombres entre SUA (PDF) y Excel. Solo indica los nombres de archivo.",
@@ -187,8 +763,36 @@ def parse_args(argv: List[str] | None = None) -> argparse.Namespace:
     parser.add_argument("excel", help="Nombre del archivo Excel dentro de la carpeta EXCEL")
     parser.add_argument("--debug", action="store_true", help="Activa logging DEBUG")
     parser.add_argument("--tesseract-cmd", default=None, help="Ruta al binario tesseract si no está en PATH")
-    parser.add_argument("--dpi", type=int, default=300, help="DPI para OCR (default: 300)")
-    parser.add_argument("--pages", type=str, help="Rango de páginas a procesar (e.g., '1-3')")
+    parser.add_argument("--dpi", type=int, default=200, help="DPI para OCR (default: 200)")
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Procesos en paralelo para OCR y listas grandes (default: núm. de CPUs). Tesseract corre con "
+        "OMP_THREAD_LIMIT=1 salvo que la variable ya esté definida",
+    )
+    parser.add_argument(
+        "--max-distance",
+        type=int,
+        default=0,
+        help=f"Ediciones (Levenshtein) toleradas por errores de OCR; los aciertos se marcan en la columna "
+        f"'{FUZZY_COLUMN}', no en 'Existe en SUA' (default: 0, desactivado)",
+    )
+    parser.add_argument(
+        "--parquet", action="store_true", help="Genera también una copia .parquet de la salida (requiere pyarrow)"
+    )
+    parser.add_argument(
+        "--no-cache", action="store_true", help="Ignora la caché de nombres del PDF (carpeta .cache)"
+    )
+    parser.add_argument(
+        "--roi",
+        type=_parse_roi,
+        default=None,
+        help="Región con los nombres, en píxeles al DPI elegido: 'izq,sup,der,inf' (default: página completa)",
+    )
+    parser.add_argument(
+        "--pages", type=_parse_pages, default=None, help="Rango de páginas a procesar (e.g., '1-3' o '5')"
+    )
     return parser.parse_args(argv)
 
 # ---------------------------------------------------------------------------
@@ -214,16 +818,26 @@ def main(argv: List[str] | None = None) -> None:
     excel_path = EXCEL_DIR / args.excel
     output_path = OUTPUT_DIR / f"{Path(args.excel).stem}_REVISADO.xlsx"
 
+    first_page, last_page = args.pages or (None, None)
+
     try:
         pdf_names = PdfNameExtractor(
             pdf_path=pdf_path,
             tesseract_cmd=args.tesseract_cmd,
             dpi=args.dpi,
+            roi=args.roi,
+            first_page=first_page,
+            last_page=last_page,
+            workers=args.workers,
+            cache_dir=None if args.no_cache else CACHE_DIR,
         ).extract_names()
 
         ExcelNameValidator(
             excel_path=excel_path,
             output_path=output_path,
+            parquet_path=output_path.with_suffix(".parquet") if args.parquet else None,
+            max_distance=args.max_distance,
+            workers=args.workers,
         ).validate(pdf_names)
 
     except (PdfExtractionError, FileNotFoundError, KeyError) as exc: